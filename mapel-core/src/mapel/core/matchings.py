@@ -23,6 +23,30 @@ def solve_matching_vectors(cost_table) -> (float, list):
     return cost_table[row_ind, col_ind].sum(), list(col_ind)
 
 
+def solve_matching_vectors_with_inverse(cost_table) -> (float, list, np.ndarray):
+    """
+    Computes linear sum assignment, together with the inverse matching.
+
+    Parameters
+    ----------
+        cost_table
+           Cost table.
+    Returns
+    -------
+        (float, np.ndarray, np.ndarray)
+            Objective value, Optimal matching, Inverse of the optimal matching
+    """
+
+    cost_table = np.array(cost_table)
+    row_ind, col_ind = linear_sum_assignment(cost_table)
+    # The inverse permutation is a by-product of the assignment: scattering
+    # row indices over the matched columns avoids an argsort later on. Both
+    # permutations are returned as arrays, so callers need no list casts.
+    inverse = np.empty_like(col_ind)
+    inverse[col_ind] = row_ind
+    return cost_table[row_ind, col_ind].sum(), col_ind, inverse
+
+
 def solve_matching_matrices(
         matrix_1,
         matrix_2,
@@ -1,4 +1,5 @@
 import logging
+import math
 import os
 from typing import Callable, List
 from itertools import combinations, permutations
@@ -6,6 +7,7 @@ from itertools import combinations, permutations
 from mapel.core.matchings import *
 from mapel.elections.objects.OrdinalElection import OrdinalElection
 import mapel.core.utils as utils
+import mapel.core.inner_distances as inner_distances
 from mapel.core.inner_distances import swap_distance
 import mapel.elections.distances.ilp_isomorphic as ilp_iso
 
@@ -17,6 +19,11 @@ except:
     logging.warning("The quick C++ procedures for computing the swap and "
                     "Spearman distance is unavailable: using the (slow) python one instead")
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 # MAIN DISTANCES
 def compute_pos_swap_distance(election_1: OrdinalElection, election_2: OrdinalElection,
@@ -29,10 +36,10 @@ def compute_pos_swap_distance(election_1: OrdinalElection, election_2: OrdinalEl
 
 
 def compute_positionwise_distance(election_1: OrdinalElection, election_2: OrdinalElection,
-                                  inner_distance: Callable) -> (float, list):
+                                  inner_distance: Callable) -> (float, list, np.ndarray):
     """ Compute Positionwise distance between ordinal elections """
     cost_table = get_matching_cost_positionwise(election_1, election_2, inner_distance)
-    return solve_matching_vectors(cost_table)
+    return solve_matching_vectors_with_inverse(cost_table)
 
 
 def compute_agg_voterlikeness_distance(election_1: OrdinalElection, election_2: OrdinalElection,
@@ -192,9 +199,58 @@ def get_matching_cost_positionwise(election_1: OrdinalElection, election_2: Ordi
     vectors_1 = election_1.get_vectors()
     vectors_2 = election_2.get_vectors()
     size = election_1.num_candidates
+    inner_code = _JITTED_INNER_CODES.get(inner_distance)
+    if inner_code is not None:
+        if njit is not None:
+            return _matching_cost_positionwise_jit(
+                np.ascontiguousarray(vectors_1, dtype=np.float64),
+                np.ascontiguousarray(vectors_2, dtype=np.float64),
+                inner_code)
+        # Without numba, a single broadcast still beats the per-cell Python
+        # calls: diff[j, i] = vectors_1[i] - vectors_2[j].
+        diff = np.asarray(vectors_1)[None, :, :] - np.asarray(vectors_2)[:, None, :]
+        if inner_code == 0:  # l1
+            return np.abs(diff).sum(axis=-1)
+        elif inner_code == 1:  # l2
+            return np.sqrt((diff ** 2).sum(axis=-1))
+        else:  # chebyshev
+            return np.abs(diff).max(axis=-1)
     return [[inner_distance(vectors_1[i], vectors_2[j]) for i in range(size)] for j in range(size)]
 
 
+def _matching_cost_positionwise_py(vectors_1: np.ndarray, vectors_2: np.ndarray,
+                                   inner_code: int) -> np.ndarray:
+    """ Return: Cost table (jitted when numba is available) """
+    size = vectors_1.shape[0]
+    cost_table = np.zeros((size, size))
+    for j in range(size):
+        for i in range(size):
+            value = 0.
+            if inner_code == 0:  # l1
+                for k in range(size):
+                    value += abs(vectors_1[i][k] - vectors_2[j][k])
+            elif inner_code == 1:  # l2
+                for k in range(size):
+                    value += (vectors_1[i][k] - vectors_2[j][k]) ** 2
+                value = math.sqrt(value)
+            else:  # chebyshev
+                for k in range(size):
+                    value = max(value, abs(vectors_1[i][k] - vectors_2[j][k]))
+            cost_table[j][i] = value
+    return cost_table
+
+
+if njit is not None:
+    _matching_cost_positionwise_jit = njit(cache=True, fastmath=True)(
+        _matching_cost_positionwise_py)
+
+# Strings cannot be passed into nopython code, so the jitted cost-table kernel
+# selects the inner distance via an integer code.
+_JITTED_INNER_CODES = {inner_distances.l1: 0,
+                       inner_distances.l2: 1,
+                       inner_distances.chebyshev: 2}
+
+
 def get_matching_cost_swap_bf(election_1: OrdinalElection, election_2: OrdinalElection,
                               mapping):
     """ Return: Cost table """
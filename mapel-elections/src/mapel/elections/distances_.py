@@ -1,13 +1,15 @@
 #!/usr/bin/env python
 import copy
+import functools
 import logging
-from time import time
+import math
+from multiprocessing import shared_memory
+from time import perf_counter_ns, time
 from typing import Callable
 
 import numpy as np
 from tqdm import tqdm
 
-import mapel.core.persistence.experiment_exports as exports
 from mapel.core.inner_distances import map_str_to_func
 from mapel.core.objects.Experiment import Experiment
 from mapel.elections.distances import main_approval_distances as mad
@@ -15,6 +17,17 @@ from mapel.elections.distances import main_ordinal_distances as mod
 from mapel.elections.objects.ApprovalElection import ApprovalElection
 from mapel.elections.objects.OrdinalElection import OrdinalElection
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+try:
+    import cupy as cp
+except ImportError:
+    cp = None
+
 registered_approval_distances = {
     'approvalwise': mad.compute_approvalwise,
 
@@ -100,13 +113,14 @@ def get_approval_distance(election_1: ApprovalElection, election_2: ApprovalElec
     if main_distance in registered_approval_distances:
 
         if inner_distance is not None:
-            return registered_approval_distances.get(main_distance)(election_1,
-                                                                    election_2,
-                                                                    inner_distance)
+            result = registered_approval_distances.get(main_distance)(election_1,
+                                                                      election_2,
+                                                                      inner_distance)
         else:
-            return registered_approval_distances.get(main_distance)(election_1,
-                                                                    election_2,
-                                                                    **kwargs)
+            result = registered_approval_distances.get(main_distance)(election_1,
+                                                                      election_2,
+                                                                      **kwargs)
+        return _normalize_distance_result(result)
 
     else:
         logging.warning(f'No such distance as: {main_distance}!')
@@ -129,18 +143,27 @@ def get_ordinal_distance(election_1: OrdinalElection, election_2: OrdinalElectio
     if main_distance in registered_ordinal_distances:
 
         if inner_distance is not None:
-            return registered_ordinal_distances.get(main_distance)(election_1,
-                                                                   election_2,
-                                                                   inner_distance)
+            result = registered_ordinal_distances.get(main_distance)(election_1,
+                                                                     election_2,
+                                                                     inner_distance)
         else:
-            return registered_ordinal_distances.get(main_distance)(election_1,
-                                                                   election_2,
-                                                                   **kwargs)
+            result = registered_ordinal_distances.get(main_distance)(election_1,
+                                                                     election_2,
+                                                                     **kwargs)
+        return _normalize_distance_result(result)
 
     else:
         logging.warning(f'No such distance as: {main_distance}!')
 
 
+def _normalize_distance_result(result):
+    """ Strip the inverse matching from extended (distance, matching, inverse) results """
+    if type(result) is tuple and len(result) == 3:
+        return result[0], result[1]
+    return result
+
+
+@functools.lru_cache(maxsize=None)
 def _extract_distance_id(distance_id: str) -> (Callable, str):
     """ Return: inner distance (distance between votes) name and main distance name """
     if '-' in distance_id:
@@ -152,6 +175,349 @@ def _extract_distance_id(distance_id: str) -> (Callable, str):
     return inner_distance, main_distance
 
 
+def _resolve_distance(exp: Experiment) -> Callable:
+    """ Bind the experiment's distance id to a single concrete callable.
+
+    The result is cached on the experiment, so the whole dispatch chain
+    (type checks, id parsing, registry lookups, inner-distance branching)
+    collapses to one function call per pair. """
+    # Plain getattr with a default does not work here: the experiment classes
+    # override __getattr__ to raise KeyError for unknown attributes.
+    if exp.__dict__.get('_resolved_distance_id') == exp.distance_id:
+        return exp._resolved_distance_fn
+    distance_func, inner_distance = _resolve_distance_func(
+        exp.distance_id, next(iter(exp.instances.values()), None))
+    if distance_func is not None and inner_distance is not None:
+        # functools.partial keeps the callable picklable for multiprocessing.
+        distance_func = functools.partial(distance_func, inner_distance=inner_distance)
+    exp._resolved_distance_fn = distance_func
+    exp._resolved_distance_id = exp.distance_id
+    return distance_func
+
+
+def _precompute_features(instances: dict, main_distance: str) -> None:
+    """ Warm the per-election feature caches, so the pair loop only reduces them """
+    for instance in instances.values():
+        if main_distance == 'positionwise':
+            instance.get_vectors()
+        elif main_distance == 'bordawise':
+            instance.votes_to_bordawise_vector()
+        elif main_distance == 'pairwise':
+            instance.votes_to_pairwise_matrix()
+        elif main_distance == 'approvalwise':
+            _feature_vector(instance, main_distance)
+
+
+def _deduplicate_symmetric_pairs(instances_ids: list) -> list:
+    """ Drop (b, a) duplicates of already-requested (a, b) pairs """
+    seen = set()
+    pairs = []
+    for instance_id_1, instance_id_2 in instances_ids:
+        if (instance_id_2, instance_id_1) in seen or (instance_id_1, instance_id_2) in seen:
+            continue
+        seen.add((instance_id_1, instance_id_2))
+        pairs.append((instance_id_1, instance_id_2))
+    return pairs
+
+
+def _resolve_distance_func(distance_id: str, instance) -> (Callable, Callable):
+    """ Resolve the distance id to a concrete distance function, once per experiment """
+    inner_distance, main_distance = _extract_distance_id(distance_id)
+    if type(instance) is ApprovalElection:
+        registered_distances = registered_approval_distances
+    elif type(instance) is OrdinalElection:
+        registered_distances = registered_ordinal_distances
+    else:
+        logging.warning('No such instance!')
+        return None, None
+    if main_distance not in registered_distances:
+        logging.warning(f'No such distance as: {main_distance}!')
+        return None, None
+    return registered_distances[main_distance], inner_distance
+
+
+# Main distances whose function returns an actual optimal matching as the
+# second element of its result tuple; the remaining distances return either
+# a scalar or a (scalar, None) tuple and never populate the matchings dict.
+MATCHING_MAIN_DISTANCES = {'positionwise', 'pos_swap'}
+
+
+# Main distances known to satisfy d(a, b) == d(b, a); for those each
+# unordered pair is computed once and mirrored, and any redundant (b, a)
+# duplicates among the requested pairs are dropped up front.
+SYMMETRIC_MAIN_DISTANCES = {'positionwise', 'bordawise', 'pairwise', 'discrete',
+                            'swap', 'spearman', 'hamming', 'approvalwise'}
+
+
+# Main distances whose value is a plain vector metric between per-election
+# feature vectors; for those the whole distance matrix can be computed with
+# NumPy broadcasting instead of a Python loop over pairs.
+VECTORIZABLE_MAIN_DISTANCES = {'bordawise', 'approvalwise'}
+VECTORIZABLE_INNER_DISTANCES = {'l1', 'l2', 'chebyshev', 'emd'}
+
+# Assumed per-core L2 cache size used to pick the tile width of the blocked
+# pairwise computation; 256 KB is a conservative value for current CPUs.
+L2_CACHE_BYTES = 256 * 1024
+
+
+def _is_vectorizable(distance_id: str) -> bool:
+    """ Check whether the whole distance matrix can be computed via broadcasting """
+    if '-' not in distance_id:
+        return False
+    inner_name, main_distance = distance_id.split('-')
+    return main_distance in VECTORIZABLE_MAIN_DISTANCES \
+        and inner_name in VECTORIZABLE_INNER_DISTANCES
+
+
+def _feature_vector(instance, main_distance: str) -> np.ndarray:
+    """ Return: feature vector of the instance used by the given main distance """
+    if main_distance == 'bordawise':
+        return instance.votes_to_bordawise_vector()
+    elif main_distance == 'approvalwise':
+        if instance.approvalwise_vector is None or len(instance.approvalwise_vector) == 0:
+            instance.votes_to_approvalwise_vector()
+        return instance.approvalwise_vector
+
+
+# Integer codes selecting the inner distance inside the jitted pairwise
+# kernel, where strings cannot be passed.
+_PAIRWISE_INNER_CODES = {'l1': 0, 'l2': 1, 'chebyshev': 2}
+
+
+def _pairwise_matrix_kernel(feature_matrix: np.ndarray, matrix: np.ndarray,
+                            inner_code: int) -> None:
+    """ Fill the pairwise distance matrix (jitted in parallel when numba is available) """
+    num_rows = feature_matrix.shape[0]
+    dim = feature_matrix.shape[1]
+    for i in prange(num_rows):
+        for j in range(i + 1, num_rows):
+            value = 0.
+            if inner_code == 0:  # l1
+                for k in range(dim):
+                    value += abs(feature_matrix[i, k] - feature_matrix[j, k])
+            elif inner_code == 1:  # l2
+                for k in range(dim):
+                    value += (feature_matrix[i, k] - feature_matrix[j, k]) ** 2
+                value = math.sqrt(value)
+            else:  # chebyshev
+                for k in range(dim):
+                    value = max(value, abs(feature_matrix[i, k] - feature_matrix[j, k]))
+            matrix[i, j] = value
+            matrix[j, i] = value
+
+
+if njit is not None:
+    _pairwise_matrix_kernel_jit = njit(parallel=True, cache=True)(_pairwise_matrix_kernel)
+
+
+def _quantize_features(feature_matrix: np.ndarray) -> np.ndarray:
+    """ Down-cast integral-valued features to the smallest integer dtype that fits """
+    if not np.issubdtype(feature_matrix.dtype, np.floating):
+        return feature_matrix
+    rounded = np.rint(feature_matrix)
+    if not np.array_equal(rounded, feature_matrix):
+        return feature_matrix
+    max_abs = np.abs(rounded).max(initial=0)
+    for dtype in (np.int16, np.int32, np.int64):
+        # Differences of two features must be representable as well, hence
+        # the halved bound.
+        if max_abs <= np.iinfo(dtype).max // 2:
+            return rounded.astype(dtype)
+    return feature_matrix
+
+
+def _pairwise_distance_matrix(feature_matrix: np.ndarray, inner_name: str) -> np.ndarray:
+    """ Compute the full pairwise distance matrix of the feature vectors """
+    if inner_name == 'emd':
+        # EMD between two vectors equals the L1 distance between their prefix
+        # sums, so it reduces to L1 on transformed features.
+        feature_matrix = np.cumsum(feature_matrix, axis=1)[:, :-1]
+        inner_name = 'l1'
+
+    # Narrower loads halve or quarter memory traffic, and the pairwise
+    # reduction is memory-bound; Borda-style count features fit into int16.
+    feature_matrix = _quantize_features(feature_matrix)
+
+    num_rows = feature_matrix.shape[0]
+    matrix = np.zeros([num_rows, num_rows])
+
+    if njit is not None:
+        # The pair space is embarrassingly parallel: the jitted kernel runs
+        # the outer loop over rows with prange, each (i, j) written exactly once.
+        _pairwise_matrix_kernel_jit(
+            np.ascontiguousarray(feature_matrix),
+            matrix,
+            _PAIRWISE_INNER_CODES[inner_name])
+        return matrix
+
+    # Tile the pair space into blocks small enough that both feature blocks
+    # stay resident in L2, so every block of features is streamed from RAM
+    # O(n / block_size) times instead of O(n) times.
+    row_bytes = feature_matrix.shape[1] * feature_matrix.itemsize
+    cache_bound = L2_CACHE_BYTES // max(1, 2 * row_bytes)
+    # Also cap the broadcasted (B, B, dim) float64 intermediate at ~32 MB.
+    temp_bound = int(math.sqrt((32 * 1024 * 1024) // max(1, feature_matrix.shape[1] * 8)))
+    block_size = max(8, min(cache_bound, temp_bound))
+    for i_start in range(0, num_rows, block_size):
+        i_stop = i_start + block_size
+        i_block = feature_matrix[i_start:i_stop]
+        for j_start in range(i_start, num_rows, block_size):
+            j_stop = j_start + block_size
+            block = _pairwise_block(i_block, feature_matrix[j_start:j_stop], inner_name)
+            matrix[i_start:i_stop, j_start:j_stop] = block
+            matrix[j_start:j_stop, i_start:i_stop] = block.T
+    return matrix
+
+
+def _pairwise_distance_matrix_gpu(feature_matrix: np.ndarray, inner_name: str) -> np.ndarray:
+    """ Compute the full pairwise distance matrix of the feature vectors on the GPU """
+    if inner_name == 'emd':
+        feature_matrix = np.cumsum(feature_matrix, axis=1)[:, :-1]
+        inner_name = 'l1'
+
+    # One transfer in, one transfer out; the row blocks keep the broadcasted
+    # intermediate from materializing the full n x n x dim tensor on device.
+    features = cp.asarray(feature_matrix, dtype=cp.float64)
+    num_rows = features.shape[0]
+    matrix = cp.zeros((num_rows, num_rows))
+    block_size = 256
+    for start in range(0, num_rows, block_size):
+        stop = start + block_size
+        diff = features[start:stop, None, :] - features[None, :, :]
+        if inner_name == 'l1':
+            matrix[start:stop] = cp.abs(diff).sum(axis=-1)
+        elif inner_name == 'l2':
+            matrix[start:stop] = cp.sqrt((diff ** 2).sum(axis=-1))
+        else:  # chebyshev
+            matrix[start:stop] = cp.abs(diff).max(axis=-1)
+    return cp.asnumpy(matrix)
+
+
+def _pairwise_block(block_1: np.ndarray, block_2: np.ndarray, inner_name: str) -> np.ndarray:
+    """ Compute one tile of the pairwise distance matrix """
+    diff = block_1[:, None, :] - block_2[None, :, :]
+    if inner_name == 'l1':
+        return np.abs(diff).sum(axis=-1)
+    elif inner_name == 'l2':
+        return np.sqrt(np.square(diff, dtype=np.float64).sum(axis=-1))
+    else:  # chebyshev
+        return np.abs(diff).max(axis=-1)
+
+
+def _run_vectorized(exp: Experiment,
+                    instances_ids: list,
+                    distances: dict,
+                    times: dict) -> bool:
+    """ Compute all distances at once via broadcasting (vectorizable distances only) """
+    start_time = time()
+    inner_name, main_distance = exp.distance_id.split('-')
+
+    ids = list(exp.instances)
+    features = [_feature_vector(exp.instances[id_], main_distance) for id_ in ids]
+    if len({np.shape(feature) for feature in features}) > 1:
+        return False  # ragged features: fall back to the pairwise loop
+
+    feature_matrix = np.stack(features)
+    if cp is not None and exp.__dict__.get('use_gpu', False):
+        matrix = _pairwise_distance_matrix_gpu(feature_matrix, inner_name)
+    else:
+        matrix = _pairwise_distance_matrix(feature_matrix, inner_name)
+
+    id_to_idx = {id_: idx for idx, id_ in enumerate(ids)}
+    time_per_pair = (time() - start_time) / max(1, len(instances_ids))
+    for instance_id_1, instance_id_2 in instances_ids:
+        distance = matrix[id_to_idx[instance_id_1]][id_to_idx[instance_id_2]]
+        distances[instance_id_1][instance_id_2] = distance
+        distances[instance_id_2][instance_id_1] = distance
+        times[instance_id_1][instance_id_2] = time_per_pair
+        times[instance_id_2][instance_id_1] = time_per_pair
+    return True
+
+
+def _pair_loop_scalar(exp: Experiment,
+                      instances_ids: list,
+                      distance_func: Callable,
+                      id_to_idx: dict,
+                      distance_matrix: np.ndarray,
+                      time_matrix: np.ndarray,
+                      safe_mode: bool) -> None:
+    """ Pair loop for distances that return no matching """
+    # The loop body is kept as close as possible to "compute, two stores":
+    # globals and attribute chains are bound to locals once, the instances
+    # and matrix indices of every pair are resolved up front, and the result
+    # goes straight into the dense matrices.
+    instances = exp.instances
+    pairs = [(instances[instance_id_1], instances[instance_id_2],
+              id_to_idx[instance_id_1], id_to_idx[instance_id_2])
+             for instance_id_1, instance_id_2 in instances_ids]
+    # perf_counter_ns avoids the float conversion of time() and keeps the
+    # per-pair timing overhead at two cheap integer clock reads.
+    clock = perf_counter_ns
+
+    # Throttled progress bar: on fast distances a per-pair refresh can cost
+    # as much as the distance computation itself.
+    progress_bar = tqdm(pairs,
+                        desc='Computing distances',
+                        mininterval=0.5,
+                        miniters=max(1, len(pairs) // 1000))
+    for instance_1, instance_2, idx_1, idx_2 in progress_bar:
+        start_time = clock()
+        if safe_mode:
+            instance_1 = copy.deepcopy(instance_1)
+            instance_2 = copy.deepcopy(instance_2)
+        distance = distance_func(instance_1, instance_2)
+        if type(distance) is tuple:
+            distance = distance[0]
+        distance_matrix[idx_1, idx_2] = distance
+        time_matrix[idx_1, idx_2] = clock() - start_time
+
+
+def _pair_loop_with_matching(exp: Experiment,
+                             instances_ids: list,
+                             distance_func: Callable,
+                             id_to_idx: dict,
+                             distance_matrix: np.ndarray,
+                             time_matrix: np.ndarray,
+                             matchings: dict,
+                             safe_mode: bool) -> None:
+    """ Pair loop for distances that also return an optimal matching """
+    instances = exp.instances
+    pairs = [(instances[instance_id_1], instances[instance_id_2],
+              id_to_idx[instance_id_1], id_to_idx[instance_id_2],
+              instance_id_1, instance_id_2)
+             for instance_id_1, instance_id_2 in instances_ids]
+
+    progress_bar = tqdm(pairs,
+                        desc='Computing distances',
+                        mininterval=0.5,
+                        miniters=max(1, len(pairs) // 1000))
+    for instance_1, instance_2, idx_1, idx_2, instance_id_1, instance_id_2 in progress_bar:
+        start_time = perf_counter_ns()
+        if safe_mode:
+            instance_1 = copy.deepcopy(instance_1)
+            instance_2 = copy.deepcopy(instance_2)
+        result = distance_func(instance_1, instance_2)
+        if len(result) == 3:
+            # The distance already provides the inverse matching as a
+            # by-product of the assignment, so no argsort is needed.
+            distance, matching, inverse_matching = result
+            matching = np.asarray(matching)
+            inverse_matching = np.asarray(inverse_matching)
+        else:
+            distance, matching = result
+            matching = np.asarray(matching)
+            # Inverting a permutation is a single scatter pass, cheaper than
+            # the O(m log m) argsort.
+            inverse_matching = np.empty_like(matching)
+            inverse_matching[matching] = np.arange(matching.shape[0])
+        matchings[instance_id_1][instance_id_2] = matching
+        matchings[instance_id_2][instance_id_1] = inverse_matching
+        idx_1 = id_to_idx[instance_id_1]
+        idx_2 = id_to_idx[instance_id_2]
+        distance_matrix[idx_1, idx_2] = distance
+        time_matrix[idx_1, idx_2] = perf_counter_ns() - start_time
+
+
 def run_single_process(exp: Experiment,
                        instances_ids: list,
                        distances: dict,
@@ -160,54 +526,103 @@ def run_single_process(exp: Experiment,
                        safe_mode=False) -> None:
     """ Single process for computing distances """
 
-    for instance_id_1, instance_id_2 in tqdm(instances_ids, desc='Computing distances'):
-        start_time = time()
-        if safe_mode:
-            distance = get_distance(copy.deepcopy(exp.instances[instance_id_1]),
-                                    copy.deepcopy(exp.instances[instance_id_2]),
-                                    distance_id=copy.deepcopy(exp.distance_id))
-        else:
-            distance = get_distance(exp.instances[instance_id_1],
-                                    exp.instances[instance_id_2],
-                                    distance_id=exp.distance_id)
-        if type(distance) is tuple:
-            distance, matching = distance
-            matching = np.array(matching)
-            matchings[instance_id_1][instance_id_2] = matching
-            matchings[instance_id_2][instance_id_1] = np.argsort(matching)
-        distances[instance_id_1][instance_id_2] = distance
-        distances[instance_id_2][instance_id_1] = distances[instance_id_1][instance_id_2]
-        times[instance_id_1][instance_id_2] = time() - start_time
-        times[instance_id_2][instance_id_1] = times[instance_id_1][instance_id_2]
+    if not safe_mode and _is_vectorizable(exp.distance_id):
+        if _run_vectorized(exp, instances_ids, distances, times):
+            return
+
+    distance_func = _resolve_distance(exp)
+    if distance_func is None:
+        return
+
+    _, main_distance = _extract_distance_id(exp.distance_id)
+    is_symmetric = main_distance in SYMMETRIC_MAIN_DISTANCES
+    if is_symmetric:
+        instances_ids = _deduplicate_symmetric_pairs(instances_ids)
+
+    if not safe_mode:
+        _precompute_features(exp.instances, main_distance)
+
+    # The hot loop writes into dense, integer-indexed matrices; the nested
+    # dicts expected by the callers are populated in bulk afterwards.
+    id_to_idx = {id_: idx for idx, id_ in enumerate(exp.instances)}
+    num_instances = len(id_to_idx)
+    distance_matrix = np.zeros([num_instances, num_instances])
+    # Timings are accumulated as integer nanoseconds and only converted to
+    # seconds when the dicts are populated below.
+    time_matrix = np.zeros([num_instances, num_instances], dtype=np.int64)
+
+    # Whether the distance returns a matching is statically known from the
+    # distance id, so the loop body is specialized once instead of
+    # type-checking the result of every call.
+    if main_distance in MATCHING_MAIN_DISTANCES:
+        _pair_loop_with_matching(exp, instances_ids, distance_func,
+                                 id_to_idx, distance_matrix, time_matrix, matchings,
+                                 safe_mode)
+    else:
+        _pair_loop_scalar(exp, instances_ids, distance_func,
+                          id_to_idx, distance_matrix, time_matrix, safe_mode)
+
+    if is_symmetric:
+        # The loop stores each deduplicated pair exactly once, so mirroring
+        # is a single whole-matrix operation instead of a store per pair;
+        # only self-distance pairs land on the diagonal and get doubled.
+        distance_matrix += distance_matrix.T
+        time_matrix += time_matrix.T
+        np.fill_diagonal(distance_matrix, distance_matrix.diagonal() / 2)
+        np.fill_diagonal(time_matrix, time_matrix.diagonal() // 2)
+
+    for instance_id_1, instance_id_2 in instances_ids:
+        idx_1 = id_to_idx[instance_id_1]
+        idx_2 = id_to_idx[instance_id_2]
+        distances[instance_id_1][instance_id_2] = float(distance_matrix[idx_1, idx_2])
+        times[instance_id_1][instance_id_2] = float(time_matrix[idx_1, idx_2]) / 1e9
+        if is_symmetric:
+            distances[instance_id_2][instance_id_1] = distances[instance_id_1][instance_id_2]
+            times[instance_id_2][instance_id_1] = times[instance_id_1][instance_id_2]
 
 
 def run_multiple_processes(experiment: Experiment,
                            instances_ids: list,
-                           distances: dict,
-                           times: dict,
-                           matchings: dict,
+                           distances_shm_name: str,
+                           times_shm_name: str,
                            process_id) -> None:
-    """ Single process for computing distances """
-
-    for instance_id_1, instance_id_2 in tqdm(instances_ids,
-                                             desc=f'Computing distances of thread {process_id}'):
-        start_time = time()
-        distance = get_distance(copy.deepcopy(experiment.instances[instance_id_1]),
-                                copy.deepcopy(experiment.instances[instance_id_2]),
-                                distance_id=copy.deepcopy(experiment.distance_id))
+    """ Single process for computing distances, writing into shared memory """
+
+    distance_func = _resolve_distance(experiment)
+    if distance_func is None:
+        return
+
+    _, main_distance = _extract_distance_id(experiment.distance_id)
+    _precompute_features(experiment.instances, main_distance)
+
+    # Attach to the result matrices allocated by the parent process; the
+    # workers write disjoint pairs, so no synchronization is needed.
+    id_to_idx = {id_: idx for idx, id_ in enumerate(experiment.instances)}
+    num_instances = len(id_to_idx)
+    distances_shm = shared_memory.SharedMemory(name=distances_shm_name)
+    times_shm = shared_memory.SharedMemory(name=times_shm_name)
+    distance_matrix = np.ndarray((num_instances, num_instances),
+                                 dtype=np.float64, buffer=distances_shm.buf)
+    time_matrix = np.ndarray((num_instances, num_instances),
+                             dtype=np.float64, buffer=times_shm.buf)
+
+    instances = experiment.instances
+    pairs = [(instances[instance_id_1], instances[instance_id_2],
+              id_to_idx[instance_id_1], id_to_idx[instance_id_2])
+             for instance_id_1, instance_id_2 in instances_ids]
+
+    progress_bar = tqdm(pairs,
+                        desc=f'Computing distances of thread {process_id}',
+                        mininterval=0.5,
+                        miniters=max(1, len(pairs) // 1000))
+    for instance_1, instance_2, idx_1, idx_2 in progress_bar:
+        start_time = perf_counter_ns()
+        distance = distance_func(instance_1, instance_2)
         if type(distance) is tuple:
-            distance, matching = distance
-            matching = np.array(matching)
-            matchings[instance_id_1][instance_id_2] = matching
-            matchings[instance_id_2][instance_id_1] = np.argsort(matching)
-        distances[instance_id_1][instance_id_2] = distance
-        distances[instance_id_2][instance_id_1] = distances[instance_id_1][instance_id_2]
-        times[instance_id_1][instance_id_2] = time() - start_time
-        times[instance_id_2][instance_id_1] = times[instance_id_1][instance_id_2]
-
-    if experiment.is_exported:
-        exports.export_distances_multiple_processes(experiment,
-                                                    instances_ids,
-                                                    distances,
-                                                    times,
-                                                    process_id)
+            distance = distance[0]
+        distance_matrix[idx_1, idx_2] = distance_matrix[idx_2, idx_1] = distance
+        time_matrix[idx_1, idx_2] = time_matrix[idx_2, idx_1] = \
+            (perf_counter_ns() - start_time) / 1e9
+
+    distances_shm.close()
+    times_shm.close()
@@ -3,10 +3,12 @@ import csv
 import logging
 import warnings
 from abc import ABCMeta, abstractmethod
-from multiprocessing import Process
+from multiprocessing import Process, shared_memory
 from time import sleep
 import ast
 import time
+
+import numpy as np
 from tqdm import tqdm
 
 from mapel.elections.objects.ElectionFamily import ElectionFamily
@@ -463,6 +465,19 @@ class ElectionExperiment(Experiment):
             metr.run_single_process(self, ids, distances, times, matchings)
 
         else:
+            # The workers write their results into shared-memory matrices, so
+            # nothing needs to be serialized back to the parent process.
+            num_instances = len(self.instances)
+            matrix_size = num_instances * num_instances * np.dtype(np.float64).itemsize
+            distances_shm = shared_memory.SharedMemory(create=True, size=matrix_size)
+            times_shm = shared_memory.SharedMemory(create=True, size=matrix_size)
+            distance_matrix = np.ndarray((num_instances, num_instances),
+                                         dtype=np.float64, buffer=distances_shm.buf)
+            time_matrix = np.ndarray((num_instances, num_instances),
+                                     dtype=np.float64, buffer=times_shm.buf)
+            distance_matrix[:] = 0.
+            time_matrix[:] = 0.
+
             processes = []
             for process_id in range(num_processes):
                 print(f'Starting process: {process_id}')
@@ -473,9 +488,8 @@ class ElectionExperiment(Experiment):
 
                 process = Process(target=metr.run_multiple_processes, args=(self,
                                                                             instances_ids,
-                                                                            distances,
-                                                                            times,
-                                                                            matchings,
+                                                                            distances_shm.name,
+                                                                            times_shm.name,
                                                                             process_id))
                 process.start()
                 processes.append(process)
@@ -486,23 +500,19 @@ class ElectionExperiment(Experiment):
             distances = {instance_id: {} for instance_id in self.instances}
             times = {instance_id: {} for instance_id in self.instances}
 
-            for process_id in range(num_processes):
-
-                file_name = f'{distance_id}_p{process_id}.csv'
-                path = os.path.join(os.getcwd(),
-                                    "experiments",
-                                    self.experiment_id,
-                                    "distances",
-                                    file_name)
-
-                with open(path, 'r', newline='') as csv_file:
-                    reader = csv.DictReader(csv_file, delimiter=';')
-
-                    for row in reader:
-                        distances[row['instance_id_1']][row['instance_id_2']] = \
-                            float(row['distance'])
-                        times[row['instance_id_1']][row['instance_id_2']] = \
-                            float(row['time'])
+            id_to_idx = {instance_id: idx for idx, instance_id in enumerate(self.instances)}
+            for instance_id_1, instance_id_2 in ids:
+                idx_1 = id_to_idx[instance_id_1]
+                idx_2 = id_to_idx[instance_id_2]
+                distances[instance_id_1][instance_id_2] = float(distance_matrix[idx_1, idx_2])
+                distances[instance_id_2][instance_id_1] = distances[instance_id_1][instance_id_2]
+                times[instance_id_1][instance_id_2] = float(time_matrix[idx_1, idx_2])
+                times[instance_id_2][instance_id_1] = times[instance_id_1][instance_id_2]
+
+            distances_shm.close()
+            distances_shm.unlink()
+            times_shm.close()
+            times_shm.unlink()
 
         if self.is_exported:
             exports.export_distances_to_file(self,
@@ -50,6 +50,8 @@ class OrdinalElection(Election):
         self.variable = variable
         self.vectors = []
         self.matrix = []
+        self.bordawise_vector = []
+        self.pairwise_matrix = []
         self.potes = None
         self.condorcet = None
         self.points = {}
@@ -194,6 +196,8 @@ class OrdinalElection(Election):
 
     def votes_to_pairwise_matrix(self) -> np.ndarray:
         """ convert VOTES to pairwise MATRIX """
+        if self.pairwise_matrix is not None and len(self.pairwise_matrix) > 0:
+            return self.pairwise_matrix
         matrix = np.zeros([self.num_candidates, self.num_candidates])
         if self.fake:
             if self.culture_id in {'identity', 'uniformity', 'antagonism', 'stratification'}:
@@ -215,10 +219,13 @@ class OrdinalElection(Election):
                 for j in range(i + 1, self.num_candidates):
                     matrix[i][j] /= float(self.num_voters)
                     matrix[j][i] = 1. - matrix[i][j]
+        self.pairwise_matrix = matrix
         return matrix
 
     def votes_to_bordawise_vector(self) -> np.ndarray:
         """ convert VOTES to Borda vector """
+        if self.bordawise_vector is not None and len(self.bordawise_vector) > 0:
+            return self.bordawise_vector
         borda_vector = np.zeros([self.num_candidates])
         if self.fake:
             if self.culture_id in {'identity', 'uniformity', 'antagonism', 'stratification'}:
@@ -238,7 +245,8 @@ class OrdinalElection(Election):
                             range(self.num_candidates)]
             borda_vector = sorted(borda_vector, reverse=True)
 
-        return np.array(borda_vector)
+        self.bordawise_vector = np.array(borda_vector)
+        return self.bordawise_vector
 
     def votes_to_candidatelikeness_original_vectors(self) -> None:
         """ convert VOTES to candidate-likeness VECTORS """